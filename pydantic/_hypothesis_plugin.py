@@ -22,18 +22,23 @@ This is because Hypothesis annotates `register_type_strategy()` with
 to generate instances of the builtin `int` type which match the constraints.
 """
 
-import contextlib
+import functools
 import ipaddress
 import json
 import math
+import operator
+import re
+from decimal import Decimal, localcontext
 from fractions import Fraction
-from typing import Callable, Dict, Type, Union, cast, overload
+from typing import Callable, Dict, Optional, Tuple, Type, Union, cast, overload
 
+import hypothesis.errors
 import hypothesis.strategies as st
 
 import pydantic
 import pydantic.color
 import pydantic.types
+import pydantic.utils
 
 # FilePath and DirectoryPath are explicitly unsupported, as we'd have to create
 # them on-disk, and that's unsafe in general without being told *where* to do so.
@@ -62,28 +67,30 @@ else:
         except email_validator.EmailNotValidError:  # pragma: no cover
             return False
 
+    _display_name_regex = re.compile('[A-Za-z0-9_]+( [A-Za-z0-9_]+){0,5}')
+    _valid_emails = st.emails().filter(is_valid_email)
+
     # Note that these strategies deliberately stay away from any tricky Unicode
     # or other encoding issues; we're just trying to generate *something* valid.
-    st.register_type_strategy(pydantic.EmailStr, st.emails().filter(is_valid_email))  # type: ignore[arg-type]
+    st.register_type_strategy(pydantic.EmailStr, _valid_emails)  # type: ignore[arg-type]
     st.register_type_strategy(
         pydantic.NameEmail,
         st.builds(
             '{} <{}>'.format,  # type: ignore[arg-type]
-            st.from_regex('[A-Za-z0-9_]+( [A-Za-z0-9_]+){0,5}', fullmatch=True),
-            st.emails().filter(is_valid_email),
+            st.from_regex(_display_name_regex, fullmatch=True),
+            _valid_emails,
         ),
     )
 
 # PyObject - dotted names, in this case taken from the math module.
-st.register_type_strategy(
-    pydantic.PyObject,
-    st.sampled_from(
-        [cast(pydantic.PyObject, f'math.{name}') for name in sorted(vars(math)) if not name.startswith('_')]
-    ),
+_math_pyobjects = tuple(
+    cast(pydantic.PyObject, f'math.{name}') for name in sorted(vars(math)) if not name.startswith('_')
 )
+st.register_type_strategy(pydantic.PyObject, st.sampled_from(_math_pyobjects))
 
-# CSS3 Colors; as name, hex, rgb(a) tuples or strings, or hsl strings
-_color_regexes = (
+# CSS3 Colors; as name, hex, rgb(a) tuples or strings, or hsl strings.
+# The pattern is compiled once here rather than by each `st.from_regex()` call.
+_color_regexes = re.compile(
     '|'.join(
         (
             pydantic.color.r_hex_short,
@@ -99,10 +106,11 @@ _color_regexes = (
     .replace(pydantic.color._r_alpha, r'(?:(0(?:\.\d+)?|1(?:\.0+)?|\.\d+|\d{1,2}%))')
     .replace(pydantic.color._r_255, r'(?:((?:\d|\d\d|[01]\d\d|2[0-4]\d|25[0-4])(?:\.\d+)?|255(?:\.0+)?))')
 )
+_color_names = tuple(sorted(pydantic.color.COLORS_BY_NAME))
 st.register_type_strategy(
     pydantic.color.Color,
     st.one_of(
-        st.sampled_from(sorted(pydantic.color.COLORS_BY_NAME)),
+        st.sampled_from(_color_names),
         st.tuples(
             st.integers(0, 255),
             st.integers(0, 255),
@@ -117,25 +125,42 @@ st.register_type_strategy(
 # Card numbers, valid according to the Luhn algorithm
 
 
+# The digit-sum of twice each digit, i.e. `2 * d` or `2 * d - 9` if that exceeds nine
+_luhn_doubled = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+
+
 def add_luhn_digit(card_number: str) -> str:
     # See https://en.wikipedia.org/wiki/Luhn_algorithm
-    for digit in '0123456789':
-        with contextlib.suppress(Exception):
-            pydantic.PaymentCardNumber.validate_luhn_check_digit(card_number + digit)
-            return card_number + digit
-    raise AssertionError('Unreachable')  # pragma: no cover
-
-
-card_patterns = (
-    # Note that these patterns omit the Luhn check digit; that's added by the function above
-    '4[0-9]{14}',  # Visa
-    '5[12345][0-9]{13}',  # Mastercard
-    '3[47][0-9]{12}',  # American Express
-    '[0-26-9][0-9]{10,17}',  # other (incomplete to avoid overlap)
+    # We double every other digit starting from the right of the payload, so
+    # the check digit is whatever brings the total to a multiple of ten.
+    digits = [int(char) for char in reversed(card_number)]
+    total = sum(_luhn_doubled[d] for d in digits[::2]) + sum(digits[1::2])
+    card_number += str(-total % 10)
+    # Cross-check against our validator, unless running with assertions disabled
+    assert pydantic.PaymentCardNumber.validate_luhn_check_digit(card_number)
+    return card_number
+
+
+def card_digits(prefixes: Tuple[str, ...], min_size: int, max_size: Optional[int] = None) -> st.SearchStrategy[str]:
+    # One of the given prefixes followed by some arbitrary digits, which is much
+    # cheaper to generate than the equivalent regular expression.
+    return st.builds(
+        operator.add,
+        st.sampled_from(prefixes),
+        st.text('0123456789', min_size=min_size, max_size=min_size if max_size is None else max_size),
+    )
+
+
+card_numbers = st.one_of(
+    # Note that these omit the Luhn check digit; that's added by the function above
+    card_digits(('4',), 14),  # Visa
+    card_digits(('51', '52', '53', '54', '55'), 13),  # Mastercard
+    card_digits(('34', '37'), 12),  # American Express
+    card_digits(('0', '1', '2', '6', '7', '8', '9'), 10, 17),  # other (incomplete to avoid overlap)
 )
 st.register_type_strategy(
     pydantic.PaymentCardNumber,
-    st.from_regex('|'.join(card_patterns), fullmatch=True).map(add_luhn_digit),  # type: ignore[arg-type]
+    card_numbers.map(add_luhn_digit),  # type: ignore[arg-type]
 )
 
 # UUIDs
@@ -144,19 +169,23 @@ st.register_type_strategy(pydantic.UUID3, st.uuids(version=3))  # type: ignore[a
 st.register_type_strategy(pydantic.UUID4, st.uuids(version=4))  # type: ignore[arg-type]
 st.register_type_strategy(pydantic.UUID5, st.uuids(version=5))  # type: ignore[arg-type]
 
-# Secrets
-st.register_type_strategy(pydantic.SecretBytes, st.binary().map(pydantic.SecretBytes))
-st.register_type_strategy(pydantic.SecretStr, st.text().map(pydantic.SecretStr))
+# Secrets; bounded in size because their contents are opaque to most tests
+st.register_type_strategy(pydantic.SecretBytes, st.binary(max_size=64).map(pydantic.SecretBytes))
+st.register_type_strategy(pydantic.SecretStr, st.text(max_size=64).map(pydantic.SecretStr))
 
-# IP addresses, networks, and interfaces
+# IP addresses, networks, and interfaces; the latter two are built directly from
+# an (integer address, prefix length) pair, which is cheaper than parsing strings.
+_ipv4_parts = st.tuples(st.integers(0, 2 ** 32 - 1), st.integers(0, 32))
+_ipv6_parts = st.tuples(st.integers(0, 2 ** 128 - 1), st.integers(0, 128))
 st.register_type_strategy(pydantic.IPvAnyAddress, st.ip_addresses())
 st.register_type_strategy(
     pydantic.IPvAnyInterface,
-    st.from_type(ipaddress.IPv4Interface) | st.from_type(ipaddress.IPv6Interface),
+    _ipv4_parts.map(ipaddress.IPv4Interface) | _ipv6_parts.map(ipaddress.IPv6Interface),
 )
 st.register_type_strategy(
     pydantic.IPvAnyNetwork,
-    st.from_type(ipaddress.IPv4Network) | st.from_type(ipaddress.IPv6Network),
+    _ipv4_parts.map(functools.partial(ipaddress.IPv4Network, strict=False))
+    | _ipv6_parts.map(functools.partial(ipaddress.IPv6Network, strict=False)),
 )
 
 # We hook into the con***() functions and the ConstrainedNumberMeta metaclass,
@@ -174,6 +203,10 @@ st.register_type_strategy(pydantic.StrictStr, st.text())  # type: ignore[arg-typ
 RESOLVERS: Dict[type, Callable[[type], st.SearchStrategy]] = {}  # type: ignore[type-arg]
 
 
+def _unsatisfiable(typ: type) -> st.SearchStrategy:  # type: ignore[type-arg]
+    raise hypothesis.errors.Unsatisfiable(f'Cannot generate valid examples for {typ!r}, whose constraints conflict')
+
+
 @overload
 def _registered(typ: Type[pydantic.types.T]) -> Type[pydantic.types.T]:
     pass
@@ -193,7 +226,12 @@ def _registered(
     pydantic.types._DEFINED_TYPES.add(typ)
     for supertype, resolver in RESOLVERS.items():
         if issubclass(typ, supertype):
-            st.register_type_strategy(typ, resolver(typ))  # type: ignore
+            strategy = resolver(typ)
+            if strategy is st.nothing():
+                # Unsatisfiable constraints are legal in Pydantic, but Hypothesis refuses
+                # to register an empty strategy - so we only fail if asked for examples.
+                strategy = _unsatisfiable
+            st.register_type_strategy(typ, strategy)  # type: ignore
             return typ
     raise NotImplementedError(f'Unknown type {typ!r} has no resolver to register')  # pragma: no cover
 
@@ -210,6 +248,20 @@ def resolves(
 
 
 # Type-to-strategy resolver functions
+#
+# Unconstrained types share a single strategy object between all classes.
+_any_binary = st.binary()
+_any_text = st.text()
+
+# Arbitrary JSON, for types we can't resolve.  This is bounded to keep documents
+# small, which makes them much cheaper to generate, serialize, and shrink.
+_json_text = st.text(st.characters(max_codepoint=127), max_size=16)
+_json_finite = st.floats(allow_infinity=False, allow_nan=False)
+_json_values = st.recursive(
+    base=st.one_of(st.none(), st.booleans(), st.integers(), _json_finite, _json_text),
+    extend=lambda x: st.lists(x, max_size=4) | st.dictionaries(_json_text, x, max_size=4),
+    max_leaves=15,
+)
 
 
 @resolves(pydantic.Json)
@@ -218,11 +270,7 @@ def resolve_json(cls):  # type: ignore[no-untyped-def]
     try:
         inner = st.none() if cls.inner_type is None else st.from_type(cls.inner_type)
     except Exception:  # pragma: no cover
-        finite = st.floats(allow_infinity=False, allow_nan=False)
-        inner = st.recursive(
-            base=st.one_of(st.none(), st.booleans(), st.integers(), finite, st.text()),
-            extend=lambda x: st.lists(x) | st.dictionaries(st.text(), x),
-        )
+        inner = _json_values
     return st.builds(
         json.dumps,
         inner,
@@ -232,25 +280,51 @@ def resolve_json(cls):  # type: ignore[no-untyped-def]
     )
 
 
-@resolves(pydantic.ConstrainedBytes)
-def resolve_conbytes(cls):  # type: ignore[no-untyped-def]  # pragma: no cover
-    min_size = cls.min_length or 0
-    max_size = cls.max_length
-    if not cls.strip_whitespace:
-        return st.binary(min_size=min_size, max_size=max_size)
+def _stripped_pattern(min_size: int, max_size: Optional[int]) -> str:
     # Fun with regex to ensure we neither start nor end with whitespace
+    if max_size == 0:
+        return ''
+    elif max_size == 1:
+        return r'\S' if min_size else r'\S?'
     repeats = '{{{},{}}}'.format(
         min_size - 2 if min_size > 2 else 0,
-        max_size - 2 if (max_size or 0) > 2 else '',
+        '' if max_size is None else max_size - 2,
     )
     if min_size >= 2:
-        pattern = rf'\W.{repeats}\W'
+        return rf'\S.{repeats}\S'
     elif min_size == 1:
-        pattern = rf'\W(.{repeats}\W)?'
-    else:
-        assert min_size == 0
-        pattern = rf'(\W(.{repeats}\W)?)?'
-    return st.from_regex(pattern.encode(), fullmatch=True)
+        return rf'\S(.{repeats}\S)?'
+    assert min_size == 0
+    return rf'(\S(.{repeats}\S)?)?'
+
+
+@resolves(pydantic.ConstrainedBytes)
+def resolve_conbytes(cls):  # type: ignore[no-untyped-def]  # pragma: no cover
+    min_size = cls.min_length or 0
+    max_size = cls.max_length
+    if not cls.strip_whitespace:
+        if min_size == 0 and max_size is None:
+            return _any_binary
+        return st.binary(min_size=min_size, max_size=max_size)
+    return st.from_regex(re.compile(_stripped_pattern(min_size, max_size).encode()), fullmatch=True)
+
+
+def _is_valid_decimal(cls, value):  # type: ignore[no-untyped-def]
+    try:
+        cls.validate(value)
+    except pydantic.errors.PydanticValueError:
+        return False
+    return True
+
+
+def _is_valid_number(cls, value):  # type: ignore[no-untyped-def]
+    # This mirrors the checks in `number_size_validator` and `number_multiple_validator`
+    if (cls.gt is not None and not value > cls.gt) or (cls.ge is not None and not value >= cls.ge):
+        return False
+    if (cls.lt is not None and not value < cls.lt) or (cls.le is not None and not value <= cls.le):
+        return False
+    mod = float(value) / float(cls.multiple_of) % 1
+    return pydantic.utils.almost_equal_floats(mod, 0.0) or pydantic.utils.almost_equal_floats(mod, 1.0)
 
 
 @resolves(pydantic.ConstrainedDecimal)
@@ -263,11 +337,45 @@ def resolve_condecimal(cls):  # type: ignore[no-untyped-def]
     if cls.lt is not None:
         assert max_value is None, 'Set `lt` or `le`, but not both'
         max_value = cls.lt
-    s = st.decimals(min_value, max_value, allow_nan=False)
-    if cls.lt is not None:
-        s = s.filter(lambda d: d < cls.lt)
-    if cls.gt is not None:
-        s = s.filter(lambda d: cls.gt < d)
+    if cls.max_digits is not None and cls.decimal_places is not None:
+        # Limiting the number of whole digits is equivalent to bounding the magnitude,
+        # so we translate that into min and max values instead of filtering.
+        # The limit has max_digits significant digits, so we compute (and negate)
+        # it with enough precision to be exact even if that exceeds the default.
+        with localcontext() as ctx:
+            ctx.prec = max(ctx.prec, cls.max_digits)
+            limit = Decimal(10) ** (cls.max_digits - cls.decimal_places) - Decimal(10) ** -cls.decimal_places
+            min_value = -limit if min_value is None else max(min_value, -limit)
+            max_value = limit if max_value is None else min(max_value, limit)
+
+    if cls.multiple_of is None:
+        if min_value is not None and max_value is not None and min_value > max_value:
+            return st.nothing()
+        s = st.decimals(min_value, max_value, allow_nan=False, places=cls.decimal_places)
+        if cls.lt is not None:
+            s = s.filter(lambda d: d < cls.lt)
+        if cls.gt is not None:
+            s = s.filter(lambda d: cls.gt < d)
+    else:
+        # As for conint, we generate the multiplier and scale it up - by a Decimal, so
+        # that the product is one too.  Large multiples can fail the approximate check
+        # in `number_multiple_validator`, so as for confloat we filter on that as well.
+        multiple_of = Decimal(str(cls.multiple_of))
+        if min_value is not None:
+            min_value = math.ceil(Fraction(min_value) / Fraction(multiple_of))
+        if max_value is not None:
+            max_value = math.floor(Fraction(max_value) / Fraction(multiple_of))
+        if min_value is not None and max_value is not None and min_value > max_value:
+            return st.nothing()
+        s = st.integers(min_value, max_value).map(lambda x: x * multiple_of)
+        s = s.filter(functools.partial(_is_valid_number, cls))
+
+    if (cls.max_digits is not None and cls.decimal_places is None) or (
+        cls.multiple_of is not None and cls.decimal_places is not None
+    ):
+        # Remaining combinations of digit constraints are rare, and not worth
+        # encoding precisely, so we just check them directly.
+        s = s.filter(functools.partial(_is_valid_decimal, cls))
     return s
 
 
@@ -285,7 +393,21 @@ def resolve_confloat(cls):  # type: ignore[no-untyped-def]
         assert max_value is None, 'Set `lt` or `le`, but not both'
         max_value = cls.lt
         exclude_max = True
-    return st.floats(min_value, max_value, exclude_min=exclude_min, exclude_max=exclude_max, allow_nan=False)
+
+    if cls.multiple_of is None:
+        return st.floats(min_value, max_value, exclude_min=exclude_min, exclude_max=exclude_max, allow_nan=False)
+
+    # As for conint, we generate the multiplier and scale it up.  Exclusive bounds,
+    # and floating-point error in the product, are then handled by filtering.
+    if min_value is not None:
+        min_value = math.ceil(Fraction(min_value) / Fraction(cls.multiple_of))
+    if max_value is not None:
+        max_value = math.floor(Fraction(max_value) / Fraction(cls.multiple_of))
+    if min_value is not None and max_value is not None and min_value > max_value:
+        return st.nothing()
+    multiple_of = float(cls.multiple_of)
+    s = st.integers(min_value, max_value).map(lambda x: x * multiple_of)
+    return s.filter(functools.partial(_is_valid_number, cls))
 
 
 @resolves(pydantic.ConstrainedInt)
@@ -303,11 +425,19 @@ def resolve_conint(cls):  # type: ignore[no-untyped-def]
         return st.integers(min_value, max_value)
 
     # These adjustments and the .map handle integer-valued multiples, while the
-    # .filter handles trickier cases as for confloat.
+    # .filter handles trickier cases as for confloat.  Floor division is exact
+    # for integers, so we only need the (slower) Fraction arithmetic otherwise.
+    all_ints = all(isinstance(x, int) for x in (min_value, max_value, cls.multiple_of) if x is not None)
     if min_value is not None:
-        min_value = math.ceil(Fraction(min_value) / Fraction(cls.multiple_of))
+        if all_ints:
+            min_value = -(-min_value // cls.multiple_of)
+        else:
+            min_value = math.ceil(Fraction(min_value) / Fraction(cls.multiple_of))
     if max_value is not None:
-        max_value = math.floor(Fraction(max_value) / Fraction(cls.multiple_of))
+        if all_ints:
+            max_value = max_value // cls.multiple_of
+        else:
+            max_value = math.floor(Fraction(max_value) / Fraction(cls.multiple_of))
     return st.integers(min_value, max_value).map(lambda x: x * cls.multiple_of)
 
 
@@ -317,24 +447,17 @@ def resolve_constr(cls):  # type: ignore[no-untyped-def]  # pragma: no cover
     max_size = cls.max_length
 
     if cls.regex is None and not cls.strip_whitespace:
+        if min_size == 0 and max_size is None:
+            return _any_text
         return st.text(min_size=min_size, max_size=max_size)
 
     if cls.regex is not None:
         strategy = st.from_regex(cls.regex)
         if cls.strip_whitespace:
             strategy = strategy.filter(lambda s: s == s.strip())
-    elif cls.strip_whitespace:
-        repeats = '{{{},{}}}'.format(
-            min_size - 2 if min_size > 2 else 0,
-            max_size - 2 if (max_size or 0) > 2 else '',
-        )
-        if min_size >= 2:
-            strategy = st.from_regex(rf'\W.{repeats}\W')
-        elif min_size == 1:
-            strategy = st.from_regex(rf'\W(.{repeats}\W)?')
-        else:
-            assert min_size == 0
-            strategy = st.from_regex(rf'(\W(.{repeats}\W)?)?')
+    else:
+        # The pattern already respects our length constraints, so no need to filter
+        return st.from_regex(re.compile(_stripped_pattern(min_size, max_size)), fullmatch=True)
 
     if min_size == 0 and max_size is None:
         return strategy